@@ -0,0 +1,46 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Add dag_id index on dag_tag
+
+Revision ID: ec8d3ddd1fcb
+Revises: e1a11ece99cc
+Create Date: 2020-09-18 11:02:17.831890
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'ec8d3ddd1fcb'
+down_revision = 'e1a11ece99cc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Apply Add dag_id index on dag_tag"""
+    # The composite primary key on dag_tag leads with name, so loading the
+    # tags for a set of DAGs (e.g. on the DAG list page) could not use an
+    # index. Cover that access path explicitly.
+    op.create_index('idx_dag_tag_dag_id', 'dag_tag', ['dag_id'], unique=False)
+
+
+def downgrade():
+    """Unapply Add dag_id index on dag_tag"""
+    op.drop_index('idx_dag_tag_dag_id', table_name='dag_tag')
@@ -1774,6 +1774,10 @@ class DagTag(Base):
     name = Column(String(100), primary_key=True)
     dag_id = Column(String(ID_LEN), ForeignKey('dag.dag_id'), primary_key=True)
 
+    __table_args__ = (
+        Index('idx_dag_tag_dag_id', dag_id, unique=False),
+    )
+
     def __repr__(self):
         return self.name
 
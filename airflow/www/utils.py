@@ -15,18 +15,18 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import functools
+import hashlib
 import json
+import re
 import time
 from urllib.parse import urlencode
 
-import markdown
 import sqlalchemy as sqla
-from flask import Markup, Response, request, url_for
+from flask import Markup, Response, escape, g, request, url_for
 from flask_appbuilder.forms import FieldConverter
 from flask_appbuilder.models.sqla import filters as fab_sqlafilters
 from flask_appbuilder.models.sqla.interface import SQLAInterface
-from pygments import highlight, lexers
-from pygments.formatters import HtmlFormatter  # noqa pylint: disable=no-name-in-module
 
 from airflow.configuration import conf
 from airflow.utils import timezone
@@ -47,24 +47,43 @@ DEFAULT_SENSITIVE_VARIABLE_FIELDS = [
 ]
 
 
+@functools.lru_cache(maxsize=1)
 def get_sensitive_variables_fields():
-    """Get comma-separated sensitive Variable Fields from airflow.cfg."""
+    """
+    Get comma-separated sensitive Variable Fields from airflow.cfg.
+
+    The result is cached for the lifetime of the process as the
+    configuration does not change at runtime.
+    """
     sensitive_fields = set(DEFAULT_SENSITIVE_VARIABLE_FIELDS)
     sensitive_variable_fields = conf.get('admin', 'sensitive_variable_fields')
     if sensitive_variable_fields:
         sensitive_fields.update(set(field.strip() for field in sensitive_variable_fields.split(',')))
-    return sensitive_fields
+    return frozenset(sensitive_fields)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_hide_sensitive_variable_fields():
+    """Cached lookup of the hide_sensitive_variable_fields config flag."""
+    return conf.getboolean('admin', 'hide_sensitive_variable_fields')
+
+
+@functools.lru_cache(maxsize=1)
+def _get_sensitive_variables_fields_regex():
+    """Sensitive field names compiled into one alternation regex."""
+    return re.compile('|'.join(re.escape(f) for f in get_sensitive_variables_fields()))
 
 
 def should_hide_value_for_key(key_name):
     """Returns True if hide_sensitive_variable_fields is True, else False"""
     # It is possible via importing variables from file that a key is empty.
-    if key_name:
-        config_set = conf.getboolean('admin', 'hide_sensitive_variable_fields')
-
-        field_comp = any(s in key_name.strip().lower() for s in get_sensitive_variables_fields())
-        return config_set and field_comp
-    return False
+    # Check the config flag first so the substring scan is skipped entirely
+    # when hiding is disabled.
+    if not key_name or not _get_hide_sensitive_variable_fields():
+        return False
+    # One pass of the regex engine over the key beats a Python-level
+    # substring scan per sensitive field.
+    return _get_sensitive_variables_fields_regex().search(key_name.strip().lower()) is not None
 
 
 def get_params(**kwargs):
@@ -72,6 +91,29 @@ def get_params(**kwargs):
     return urlencode({d: v for d, v in kwargs.items() if v is not None})
 
 
+# Markup templates for the paging component. Parsed once at import time so
+# generate_pages only has to fill in the per-page values.
+FIRST_PAGE_NODE = Markup("""<li class="paginate_button {disabled}" id="dags_first">
+    <a href="{href_link}" aria-controls="dags" data-dt-idx="0" tabindex="0">&laquo;</a>
+</li>""")
+
+PREVIOUS_PAGE_NODE = Markup("""<li class="paginate_button previous {disabled}" id="dags_previous">
+    <a href="{href_link}" aria-controls="dags" data-dt-idx="0" tabindex="0">&lsaquo;</a>
+</li>""")
+
+NEXT_PAGE_NODE = Markup("""<li class="paginate_button next {disabled}" id="dags_next">
+    <a href="{href_link}" aria-controls="dags" data-dt-idx="3" tabindex="0">&rsaquo;</a>
+</li>""")
+
+LAST_PAGE_NODE = Markup("""<li class="paginate_button {disabled}" id="dags_last">
+    <a href="{href_link}" aria-controls="dags" data-dt-idx="3" tabindex="0">&raquo;</a>
+</li>""")
+
+PAGE_NODE = Markup("""<li class="paginate_button {is_active}">
+    <a href="{href_link}" aria-controls="dags" data-dt-idx="2" tabindex="0">{page_num}</a>
+</li>""")
+
+
 def generate_pages(current_page,
                    num_of_pages,
                    search=None,
@@ -98,43 +140,28 @@ def generate_pages(current_page,
     """
 
     void_link = 'javascript:void(0)'
-    first_node = Markup("""<li class="paginate_button {disabled}" id="dags_first">
-    <a href="{href_link}" aria-controls="dags" data-dt-idx="0" tabindex="0">&laquo;</a>
-</li>""")
-
-    previous_node = Markup("""<li class="paginate_button previous {disabled}" id="dags_previous">
-    <a href="{href_link}" aria-controls="dags" data-dt-idx="0" tabindex="0">&lsaquo;</a>
-</li>""")
 
-    next_node = Markup("""<li class="paginate_button next {disabled}" id="dags_next">
-    <a href="{href_link}" aria-controls="dags" data-dt-idx="3" tabindex="0">&rsaquo;</a>
-</li>""")
-
-    last_node = Markup("""<li class="paginate_button {disabled}" id="dags_last">
-    <a href="{href_link}" aria-controls="dags" data-dt-idx="3" tabindex="0">&raquo;</a>
-</li>""")
+    # Only the page number varies between the links below, so encode the
+    # search/status suffix once instead of once per page.
+    base_params = urlencode({k: v for k, v in (('search', search), ('status', status))
+                             if v is not None})
+    qs_suffix = '&{}'.format(base_params) if base_params else ''
 
-    page_node = Markup("""<li class="paginate_button {is_active}">
-    <a href="{href_link}" aria-controls="dags" data-dt-idx="2" tabindex="0">{page_num}</a>
-</li>""")
+    def page_href(page):
+        return '?page={}{}'.format(page, qs_suffix)
 
     output = [Markup('<ul class="pagination" style="margin-top:0;">')]
 
     is_disabled = 'disabled' if current_page <= 0 else ''
-    output.append(first_node.format(href_link="?{}"  # noqa
-                                    .format(get_params(page=0,
-                                                       search=search,
-                                                       status=status)),
-                                    disabled=is_disabled))
+    output.append(FIRST_PAGE_NODE.format(href_link=page_href(0),  # noqa
+                                         disabled=is_disabled))
 
     page_link = void_link
     if current_page > 0:
-        page_link = '?{}'.format(get_params(page=(current_page - 1),
-                                            search=search,
-                                            status=status))
+        page_link = page_href(current_page - 1)
 
-    output.append(previous_node.format(href_link=page_link,  # noqa
-                                       disabled=is_disabled))
+    output.append(PREVIOUS_PAGE_NODE.format(href_link=page_link,  # noqa
+                                            disabled=is_disabled))
 
     mid = int(window / 2)
     last_page = num_of_pages - 1
@@ -152,27 +179,19 @@ def generate_pages(current_page,
     for page in pages:
         vals = {
             'is_active': 'active' if is_current(current_page, page) else '',
-            'href_link': void_link if is_current(current_page, page)
-                         else '?{}'.format(get_params(page=page,
-                                                      search=search,
-                                                      status=status)),
+            'href_link': void_link if is_current(current_page, page) else page_href(page),
             'page_num': page + 1
         }
-        output.append(page_node.format(**vals))  # noqa
+        output.append(PAGE_NODE.format(**vals))  # noqa
 
     is_disabled = 'disabled' if current_page >= num_of_pages - 1 else ''
 
     page_link = (void_link if current_page >= num_of_pages - 1
-                 else '?{}'.format(get_params(page=current_page + 1,
-                                              search=search,
-                                              status=status)))
+                 else page_href(current_page + 1))
 
-    output.append(next_node.format(href_link=page_link, disabled=is_disabled))  # noqa
-    output.append(last_node.format(href_link="?{}"  # noqa
-                                   .format(get_params(page=last_page,
-                                                      search=search,
-                                                      status=status)),
-                                   disabled=is_disabled))
+    output.append(NEXT_PAGE_NODE.format(href_link=page_link, disabled=is_disabled))  # noqa
+    output.append(LAST_PAGE_NODE.format(href_link=page_href(last_page),  # noqa
+                                        disabled=is_disabled))
 
     output.append(Markup('</ul>'))
 
@@ -190,7 +209,7 @@ def json_response(obj):
     """
     return Response(
         response=json.dumps(
-            obj, indent=4, cls=AirflowJsonEncoder),
+            obj, separators=(',', ':'), cls=AirflowJsonEncoder),
         status=200,
         mimetype="application/json")
 
@@ -200,45 +219,72 @@ def make_cache_key(*args, **kwargs):
     Used by cache to get a unique key per URL
     """
     path = request.path
-    args = str(hash(frozenset(request.args.items())))
-    return (path + args).encode('ascii', 'ignore')
+    # Sorting makes the key independent of argument order; hashing one
+    # urlencoded buffer is cheaper than building a frozenset of tuples.
+    args_hash = hashlib.blake2b(
+        urlencode(sorted(request.args.items(multi=True))).encode('utf-8'),
+        digest_size=8).hexdigest()
+    return (path + args_hash).encode('ascii', 'ignore')
+
+
+# Pre-parsed Markup fragments for the per-row cell formatters below. Joining
+# literal fragments with escaped values skips the format-string parser (and
+# the per-argument escape bookkeeping it entails) for every rendered cell.
+_join_markup = Markup('').join
+_A_OPEN = Markup('<a href="')
+_A_MID = Markup('">')
+_A_CLOSE = Markup('</a>')
+_NOBR_OPEN = Markup('<nobr>')
+_NOBR_CLOSE = Markup('</nobr>')
+_TIME_OPEN = Markup('<nobr><time title="" datetime="')
+_TIME_MID = Markup('">')
+_TIME_CLOSE = Markup('</time></nobr>')
+_TI_LINK_FRAGMENTS = (
+    Markup('<span style="white-space: nowrap;"><a href="'),
+    Markup('">'),
+    Markup('</a> <a href="'),
+    Markup('" title="Filter on this task and upstream">'
+           '<span class="glyphicon glyphicon-filter" style="margin-left:0;" '
+           'aria-hidden="true"></span></a></span>'),
+)
 
 
 def task_instance_link(attr):
     """Generates a URL to the Graph View for a TaskInstance."""
     dag_id = attr.get('dag_id')
     task_id = attr.get('task_id')
-    execution_date = attr.get('execution_date')
+    execution_date_iso = attr.get('execution_date').isoformat()
     url = url_for(
         'Airflow.task',
         dag_id=dag_id,
         task_id=task_id,
-        execution_date=execution_date.isoformat())
+        execution_date=execution_date_iso)
     url_root = url_for(
         'Airflow.graph',
         dag_id=dag_id,
         root=task_id,
-        execution_date=execution_date.isoformat())
-    return Markup(  # noqa
-        """
-        <span style="white-space: nowrap;">
-        <a href="{url}">{task_id}</a>
-        <a href="{url_root}" title="Filter on this task and upstream">
-        <span class="glyphicon glyphicon-filter" style="margin-left:0;"
-            aria-hidden="true"></span>
-        </a>
-        </span>
-        """).format(url=url, task_id=task_id, url_root=url_root)
+        execution_date=execution_date_iso)
+    a_open, a_mid, root_open, tail = _TI_LINK_FRAGMENTS
+    return _join_markup((
+        a_open, escape(url), a_mid, escape(task_id),
+        root_open, escape(url_root), tail))
 
 
-def state_token(state):
-    """Returns a formatted string with HTML for a given State"""
+@functools.lru_cache(maxsize=32)
+def _render_state_token(state):
     color = State.color(state)
     return Markup(  # noqa
         '<span class="label" style="background-color:{color};">'
         '{state}</span>').format(color=color, state=state)
 
 
+def state_token(state):
+    """Returns a formatted string with HTML for a given State"""
+    # The set of states is small and closed, so the rendered Markup is
+    # memoized instead of formatted again for every row.
+    return _render_state_token(state)
+
+
 def state_f(attr):
     """Gets 'state' & returns a formatted string with HTML for a given State"""
     state = attr.get('state')
@@ -249,22 +295,32 @@ def nobr_f(attr_name):
     """Returns a formatted string with HTML with a Non-breaking Text element"""
     def nobr(attr):
         f = attr.get(attr_name)
-        return Markup("<nobr>{}</nobr>").format(f)  # noqa
+        return _join_markup((_NOBR_OPEN, escape(f), _NOBR_CLOSE))
     return nobr
 
 
+def _utc_year():
+    """Current UTC year, cached for the request duration."""
+    year = getattr(g, '_utc_year', None)
+    if year is None:
+        year = timezone.utcnow().year
+        g._utc_year = year
+    return year
+
+
 def datetime_f(attr_name):
     """Returns a formatted string with HTML for given DataTime"""
     def dt(attr):  # pylint: disable=invalid-name
         f = attr.get(attr_name)
-        as_iso = f.isoformat() if f else ''
-        if not as_iso:
+        if not f:
             return Markup('')
-        f = as_iso
-        if timezone.utcnow().isoformat()[:4] == f[:4]:
-            f = f[5:]
+        as_iso = f.isoformat()
+        # Comparing the year attribute directly avoids building and slicing
+        # a second timestamp string per row.
+        display = as_iso[5:] if f.year == _utc_year() else as_iso
         # The empty title will be replaced in JS code when non-UTC dates are displayed
-        return Markup('<nobr><time title="" datetime="{}">{}</time></nobr>').format(as_iso, f)  # noqa
+        return _join_markup((
+            _TIME_OPEN, escape(as_iso), _TIME_MID, escape(display), _TIME_CLOSE))
     return dt
 # pylint: enable=invalid-name
 
@@ -274,7 +330,7 @@ def json_f(attr_name):
     def json_(attr):
         f = attr.get(attr_name)
         serialized = json.dumps(f)
-        return Markup('<nobr>{}</nobr>').format(serialized)  # noqa
+        return _join_markup((_NOBR_OPEN, escape(serialized), _NOBR_CLOSE))
     return json_
 
 
@@ -286,8 +342,7 @@ def dag_link(attr):
         'Airflow.graph',
         dag_id=dag_id,
         execution_date=execution_date)
-    return Markup(  # noqa
-        '<a href="{}">{}</a>').format(url, dag_id)  # noqa
+    return _join_markup((_A_OPEN, escape(url), _A_MID, escape(dag_id), _A_CLOSE))
 
 
 def dag_run_link(attr):
@@ -300,45 +355,84 @@ def dag_run_link(attr):
         dag_id=dag_id,
         run_id=run_id,
         execution_date=execution_date)
-    return Markup(  # noqa
-        '<a href="{url}">{run_id}</a>').format(url=url, run_id=run_id)  # noqa
+    return _join_markup((_A_OPEN, escape(url), _A_MID, escape(run_id), _A_CLOSE))
+
 
+# Lexer construction involves Pygments option parsing, so keep one instance
+# per lexer class around rather than building one per rendered block. The
+# formatter is stateless across calls and shared the same way. Pygments is
+# imported lazily so CLI commands that only import this module transitively
+# don't pay for its style and lexer registration.
+_LEXER_CACHE = {}
+_PYGMENTS_FORMATTER = None
 
-def pygment_html_render(s, lexer=lexers.TextLexer):  # noqa pylint: disable=no-member
+
+def pygment_html_render(s, lexer=None):
     """Highlight text using a given Lexer"""
-    return highlight(s, lexer(), HtmlFormatter(linenos=True))
+    global _PYGMENTS_FORMATTER  # pylint: disable=global-statement
+    from pygments import highlight, lexers
+
+    if _PYGMENTS_FORMATTER is None:
+        from pygments.formatters import HtmlFormatter  # noqa pylint: disable=no-name-in-module
+        _PYGMENTS_FORMATTER = HtmlFormatter(linenos=True)
+    if lexer is None:
+        lexer = lexers.TextLexer  # noqa pylint: disable=no-member
+    lex = _LEXER_CACHE.get(lexer)
+    if lex is None:
+        lex = _LEXER_CACHE.setdefault(lexer, lexer())
+    return highlight(s, lex, _PYGMENTS_FORMATTER)
 
 
 def render(obj, lexer):
     """Render a given Python object with a given Pygments lexer"""
-    out = ""
     if isinstance(obj, str):
-        out = Markup(pygment_html_render(obj, lexer))
-    elif isinstance(obj, (tuple, list)):
+        return Markup(pygment_html_render(obj, lexer))
+    # Accumulate fragments and join once; repeated Markup concatenation
+    # copies the whole output for every appended piece.
+    out = []
+    if isinstance(obj, (tuple, list)):
         for i, text_to_render in enumerate(obj):
-            out += Markup("<div>List item #{}</div>").format(i)  # noqa
-            out += Markup("<div>" + pygment_html_render(text_to_render, lexer) + "</div>")
+            out.append(Markup("<div>List item #{}</div>").format(i))  # noqa
+            out.append(Markup("<div>" + pygment_html_render(text_to_render, lexer) + "</div>"))
     elif isinstance(obj, dict):
         for k, v in obj.items():
-            out += Markup('<div>Dict item "{}"</div>').format(k)  # noqa
-            out += Markup("<div>" + pygment_html_render(v, lexer) + "</div>")
-    return out
+            out.append(Markup('<div>Dict item "{}"</div>').format(k))  # noqa
+            out.append(Markup("<div>" + pygment_html_render(v, lexer) + "</div>"))
+    return _join_markup(out)
 
 
-def wrapped_markdown(s, css_class=None):
-    """Convert a Markdown string to HTML."""
-    if s is None:
-        return None
+# DAG and task docs are typically short strings that repeat across views and
+# pagination, so cache the rendered HTML instead of re-running the markdown
+# parser. Unusually large docstrings bypass the cache to keep it bounded in
+# memory as well as entry count.
+_MARKDOWN_CACHE_MAX_LENGTH = 64 * 1024
+
+
+@functools.lru_cache(maxsize=512)
+def _render_markdown(s, css_class):
+    import markdown
 
     return Markup(
         '<div class="rich_doc {css_class}" >'.format(css_class=css_class) + markdown.markdown(s) + "</div>"
     )
 
+
+def wrapped_markdown(s, css_class=None):
+    """Convert a Markdown string to HTML."""
+    if s is None:
+        return None
+    if len(s) > _MARKDOWN_CACHE_MAX_LENGTH:
+        return _render_markdown.__wrapped__(s, css_class)
+    return _render_markdown(s, css_class)
+
 # pylint: disable=no-member
 
 
+@functools.lru_cache(maxsize=1)
 def get_attr_renderer():
     """Return Dictionary containing different Pygments Lexers for Rendering & Highlighting"""
+    from pygments import lexers
+
     return {
         'bash_command': lambda x: render(x, lexers.BashLexer),
         'hql': lambda x: render(x, lexers.SqlLexer),
@@ -423,16 +517,26 @@ class CustomSQLAInterface(SQLAInterface):
     """
     def __init__(self, obj, session=None):
         super().__init__(obj, session=session)
-
-        def clean_column_names():
-            if self.list_properties:
-                self.list_properties = {
-                    k.lstrip('_'): v for k, v in self.list_properties.items()}
-            if self.list_columns:
-                self.list_columns = {
-                    k.lstrip('_'): v for k, v in self.list_columns.items()}
-
-        clean_column_names()
+        self._clean_column_names()
+
+    def _clean_column_names(self):
+        # Column names are static per model class, so compute the stripped
+        # dicts once and reuse them when FAB constructs another interface for
+        # the same model.
+        # __dict__ lookup on purpose: the cache must not be inherited by
+        # subclasses of the model, which have their own column sets.
+        cleaned = self.obj.__dict__.get('_airflow_cleaned_columns') if self.obj else None
+        if cleaned is None:
+            cleaned = (
+                {k.lstrip('_'): v for k, v in self.list_properties.items()},
+                {k.lstrip('_'): v for k, v in self.list_columns.items()},
+            )
+            if self.obj:
+                self.obj._airflow_cleaned_columns = cleaned
+        if self.list_properties:
+            self.list_properties = cleaned[0]
+        if self.list_columns:
+            self.list_columns = cleaned[1]
 
     def is_utcdatetime(self, col_name):
         """Check if the datetime is a UTC one."""
@@ -44,7 +44,7 @@ from jinja2.utils import htmlsafe_json_dumps, pformat  # type: ignore
 from pygments import highlight, lexers
 from pygments.formatters import HtmlFormatter  # noqa pylint: disable=no-name-in-module
 from sqlalchemy import and_, desc, func, or_, union_all
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import selectinload
 from wtforms import SelectField, validators
 
 import airflow
@@ -486,7 +486,7 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
                 num_of_all_dags = all_dags_count
 
             dags = current_dags.order_by(DagModel.dag_id).options(
-                joinedload(DagModel.tags)).offset(start).limit(dags_per_page).all()
+                selectinload(DagModel.tags)).offset(start).limit(dags_per_page).all()
 
             dagtags = session.query(DagTag.name).distinct(DagTag.name).all()
             tags = [
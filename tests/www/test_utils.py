@@ -29,6 +29,18 @@ from tests.test_utils.config import conf_vars
 
 
 class TestUtils(unittest.TestCase):
+    def setUp(self):
+        # The sensitive field configuration is cached per process, so make
+        # sure each test sees the configuration it sets up.
+        utils.get_sensitive_variables_fields.cache_clear()
+        utils._get_hide_sensitive_variable_fields.cache_clear()
+        utils._get_sensitive_variables_fields_regex.cache_clear()
+
+    def tearDown(self):
+        utils.get_sensitive_variables_fields.cache_clear()
+        utils._get_hide_sensitive_variable_fields.cache_clear()
+        utils._get_sensitive_variables_fields_regex.cache_clear()
+
     def test_empty_variable_should_not_be_hidden(self):
         self.assertFalse(utils.should_hide_value_for_key(""))
         self.assertFalse(utils.should_hide_value_for_key(None))